@@ -24,73 +24,260 @@ Versão: 1.0
 # ==============================================
 
 # Bibliotecas para manipulação de arquivos e dados
+import gc  # Para liberar a memória dos dados após a inicialização
 import os  # Para operações com sistema de arquivos
+import json  # Para decodificar as figuras já serializadas
 import pandas as pd  # Para manipulação de dados em DataFrames
+import numpy as np  # Para cálculos vetorizados (ajuste da regressão)
+import pyarrow as pa  # Tipos de coluna do Apache Arrow
+from pyarrow import csv as pa_csv  # Leitor de CSV multithread do Arrow
 
 # Bibliotecas para criação da aplicação web e visualizações
 import dash  # Framework principal
 from dash import dcc, html  # Componentes de interface
-from dash.dependencies import Input, Output  # Para interatividade
+from dash.dependencies import Input, Output, State  # Para interatividade
 import plotly.express as px  # Para gráficos de alto nível
 import plotly.graph_objects as go  # Para gráficos de baixo nível
+import plotly.io as pio  # Para serializar as figuras em JSON
 from plotly.subplots import make_subplots  # Para gráficos múltiplos
 
+# Biblioteca para cache compartilhado entre processos
+from flask_caching import Cache  # Cache das figuras em disco
+
 # ==============================================
 # 2. CONFIGURAÇÕES INICIAIS E CARREGAMENTO DE DADOS
 # ==============================================
 
 """
 ETAPAS DO PROCESSAMENTO DE DADOS:
-1. Definir caminho para o arquivo CSV
-2. Carregar os dados em um DataFrame
-3. Converter colunas para tipos numéricos
+1. Definir caminho para o arquivo CSV (e para a sua cópia em Parquet)
+2. Se a cópia em Parquet for mais nova que o CSV e que o app.py, carregá-la
+   e pular as etapas 3 a 5
+3. Carregar apenas as colunas usadas, já com os tipos definidos
 4. Remover valores nulos
+5. Salvar o resultado em Parquet para as próximas inicializações
 """
 
 # Caminho absoluto para o arquivo CSV (compatível com Render)
 current_dir = os.path.dirname(__file__)  # Pega o diretório atual do script
 csv_path = os.path.join(current_dir, 'ecommerce_estatistica.csv')  # Monta o caminho completo
 
-try:
-    # Carrega os dados do arquivo CSV
-    df = pd.read_csv(csv_path)
-    
-    # Conversão de tipos numéricos (evita problemas com gráficos)
-    # 'errors=coerce' transforma valores inválidos em NaN
-    df['Preço'] = pd.to_numeric(df['Preço'], errors='coerce')
-    df['Qtd_Vendidos'] = pd.to_numeric(df['Qtd_Vendidos'], errors='coerce')
+# Cópia já tratada dos dados em Parquet (formato binário e colunar,
+# muito mais rápido de carregar do que reinterpretar o CSV)
+parquet_path = os.path.join(current_dir, 'ecommerce_estatistica.parquet')
+
+# Cache das figuras em disco, compartilhado por todos os processos do Gunicorn
+# e preservado entre reinicializações (a pasta é gerada e ignorada pelo git).
+# Para usar Redis, basta trocar o CACHE_TYPE para 'RedisCache' e informar o
+# CACHE_REDIS_URL.
+cache = Cache(config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': os.path.join(current_dir, 'cache-directory'),
+    'CACHE_DEFAULT_TIMEOUT': 0  # As figuras não expiram
+})
+
+# Versão dos dados (datas de modificação do CSV e deste arquivo), incluída na
+# chave do cache para que figuras antigas não sejam reaproveitadas quando o
+# CSV ou o código dos gráficos mudar
+VERSAO_DADOS = '-'.join(
+    str(os.path.getmtime(caminho)) if os.path.exists(caminho) else '0'
+    for caminho in (csv_path, __file__)
+)
+
+# Colunas lidas do CSV e seus tipos. Números em float32 ocupam metade da
+# memória e colunas de texto repetitivas são lidas como dicionário
+# (viram 'category' no pandas, com códigos inteiros).
+# A coluna 'Qtd_Vendidos' do CSV guarda faixas em texto ('+100', '+10mil');
+# o valor numérico de cada faixa está em 'Qtd_Vendidos_Cod', lida no lugar dela.
+TIPOS_COLUNAS = {
+    'Preço': pa.float32(),
+    'Qtd_Vendidos_Cod': pa.float32(),
+    'N_Avaliações': pa.float32(),
+    'Nota': pa.float32(),
+    'Desconto': pa.float32(),
+    'Marca': pa.dictionary(pa.int32(), pa.string()),
+    'Gênero': pa.dictionary(pa.int32(), pa.string())
+}
+
+def ler_csv(tipos_colunas):
+    """
+    Lê do CSV apenas as colunas de `tipos_colunas`, já convertidas, usando o
+    leitor do Arrow (analisa o arquivo em paralelo, em várias threads).
     
-    # Remove linhas com valores nulos nas colunas numéricas
-    df = df.dropna(subset=['Preço', 'Qtd_Vendidos'])
+    Parâmetros:
+        tipos_colunas (dict): Nome de cada coluna e o seu tipo no Arrow
+        
+    Retorna:
+        DataFrame: Colunas numpy comuns; dicionários viram 'category'
+    """
+    return pa_csv.read_csv(
+        csv_path,
+        # As avaliações contêm quebras de linha dentro das aspas
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(tipos_colunas),
+            column_types=tipos_colunas
+        )
+    ).to_pandas()
+
+# Colunas do DataFrame final, usadas pelos gráficos
+COLUNAS = ['Preço', 'Qtd_Vendidos', 'N_Avaliações', 'Nota', 'Desconto', 'Marca', 'Gênero']
+
+try:
+    df = None
+
+    # O Parquet só vale se for mais novo que o CSV e que este arquivo: uma
+    # mudança no carregamento (tipos, colunas, limpeza) também o invalida
+    if (os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= max(
+                os.path.getmtime(csv_path), os.path.getmtime(__file__))):
+        try:
+            # Parquet atualizado: já contém os dados tratados e tipados
+            df = pd.read_parquet(parquet_path, columns=COLUNAS)
+        except Exception as e:
+            # Arquivo corrompido ou incompleto: volta a usar o CSV
+            print(f"Aviso: não foi possível ler o cache em Parquet: {e}")
+
+    if df is None:
+        try:
+            # Carrega do CSV somente as colunas necessárias, já convertidas
+            df = ler_csv(TIPOS_COLUNAS)
+        except pa.ArrowInvalid as e:
+            # Algum valor numérico inválido faz a conversão do Arrow falhar por
+            # inteiro: lê as colunas numéricas como texto e converte uma a uma,
+            # transformando apenas os valores inválidos em NaN ('coerce')
+            print(f"Aviso: valores numéricos inválidos no CSV: {e}")
+            numericas = [c for c, t in TIPOS_COLUNAS.items() if pa.types.is_floating(t)]
+            df = ler_csv({
+                c: pa.string() if c in numericas else t
+                for c, t in TIPOS_COLUNAS.items()
+            })
+            for coluna in numericas:
+                df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype('float32')
+
+        df = df.rename(columns={'Qtd_Vendidos_Cod': 'Qtd_Vendidos'})[COLUNAS]
+        
+        # Remove linhas com valores nulos nas colunas numéricas
+        df = df.dropna(subset=['Preço', 'Qtd_Vendidos'])
+
+        # Marca e Gênero já chegam como 'category'; descarta as categorias que
+        # só existiam nas linhas removidas, para que as contagens ignorem-nas
+        df = df.assign(**{
+            coluna: df[coluna].cat.remove_unused_categories()
+            for coluna in ('Marca', 'Gênero')
+        })
+
+        # Salva os dados tratados para as próximas inicializações. A escrita vai
+        # para um arquivo temporário na mesma pasta, que depois substitui o
+        # Parquet de uma só vez (os.replace): outro processo nunca lê um arquivo
+        # pela metade e duas escritas simultâneas não deixam um arquivo corrompido
+        parquet_temporario = f"{parquet_path}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(parquet_temporario, index=False, compression='snappy')
+            os.replace(parquet_temporario, parquet_path)
+        except Exception as e:
+            # Sem permissão de escrita, apenas segue usando o CSV
+            print(f"Aviso: não foi possível salvar o cache em Parquet: {e}")
+            try:
+                os.remove(parquet_temporario)  # Descarta a escrita incompleta
+            except OSError:
+                pass
 
 except Exception as e:
     # Tratamento de erro robusto para evitar falhas na aplicação
     print(f"Erro ao carregar dados: {e}")
     df = pd.DataFrame()  # Cria um DataFrame vazio para evitar erros
 
+# Frequências usadas pelos gráficos de barras e de pizza e resumo exibido
+# no layout. Como os dados não mudam depois de carregados, tudo é calculado
+# uma única vez aqui.
+TOP_MARCAS = pd.Series(dtype='int64')  # 7 marcas mais comuns
+TOP_GENEROS = pd.Series(dtype='int64')  # 3 gêneros mais comuns
+TOTAL_PRODUTOS = len(df)
+PRECO_MEDIO = 0.0
+PRECO_MAXIMO = 0.0
+if not df.empty:
+    TOP_MARCAS = df['Marca'].value_counts().head(7)
+    TOP_GENEROS = df['Gênero'].value_counts().head(3)
+    # Reduções direto no array numpy (a média soma em float64)
+    PRECO_MEDIO = float(df['Preço'].to_numpy().mean(dtype=np.float64))
+    PRECO_MAXIMO = float(df['Preço'].to_numpy().max())
+
 # ==============================================
 # 3. FUNÇÕES AUXILIARES PARA CRIAÇÃO DE GRÁFICOS
 # ==============================================
 
+# Número máximo de pontos enviados ao navegador nos gráficos ponto a ponto
+MAX_PONTOS = 2000
+
+# Serializa as figuras com o orjson (código nativo) em vez do codificador em
+# Python puro. Fixado explicitamente: sem o orjson instalado, a aplicação
+# falha ao iniciar em vez de voltar silenciosamente ao codificador lento.
+pio.json.config.default_engine = 'orjson'
+
+# Tema compartilhado pelos gráficos de dispersão (fundo cinza claro).
+# É registrado uma única vez e combinado com o tema padrão do Plotly, em vez
+# de cada função montar e aplicar o seu próprio dicionário de layout.
+pio.templates['painel_cinza'] = go.layout.Template(layout={
+    'plot_bgcolor': 'rgba(240,240,240,0.8)',  # Cor de fundo do gráfico
+    'paper_bgcolor': 'rgba(240,240,240,0.5)'  # Cor de fundo ao redor do gráfico
+})
+TEMPLATE_CINZA = 'plotly+painel_cinza'
+
+# Variáveis numéricas comparadas no mapa de calor de correlações
+COLUNAS_HEATMAP = ['Preço', 'Qtd_Vendidos', 'N_Avaliações', 'Nota', 'Desconto']
+
+# Colunas de COLUNAS_HEATMAP presentes nos dados e com tipo numérico,
+# resolvidas uma única vez após o carregamento
+COLUNAS_NUMERICAS = [
+    c for c in COLUNAS_HEATMAP
+    if c in df.columns and pd.api.types.is_numeric_dtype(df[c])
+]
+
+def amostrar_pontos(dados, n=MAX_PONTOS):
+    """
+    Reduz o DataFrame a no máximo `n` linhas para os gráficos que desenham um
+    ponto por produto, limitando o tamanho do JSON enviado ao navegador.
+    
+    A amostra usa semente fixa, então a figura é a mesma a cada inicialização.
+    
+    Parâmetros:
+        dados (DataFrame): Dados completos
+        n (int): Quantidade máxima de linhas
+        
+    Retorna:
+        DataFrame: Os próprios dados, se já forem pequenos, ou uma amostra
+    """
+    if len(dados) <= n:
+        return dados
+    return dados.sample(n=n, random_state=0)
+
 def criar_histograma():
     """
     Cria um histograma mostrando a distribuição dos preços dos produtos.
     
+    As contagens são calculadas no servidor com np.histogram: o navegador
+    recebe apenas as 30 barras, e não todos os preços para reagrupar.
+    
     Retorna:
         Figure: Objeto de figura do Plotly contendo o histograma
     """
-    fig = px.histogram(
-        df,
-        x='Preço',  # Eixo X: preços dos produtos
-        nbins=30,  # Número de intervalos (bins)
-        title="Distribuição dos Preços dos Produtos",
-        labels={'Preço': 'Preço (R$)'},  # Rótulos personalizados
-        color_discrete_sequence=['#636EFA'],  # Cor azul padrão
-        template="plotly_white"  # Template de fundo branco
+    # Quantidade de produtos em cada um dos 30 intervalos (bins) de preço
+    contagens, limites = np.histogram(
+        df['Preço'].to_numpy(dtype=np.float32),
+        bins=30
     )
+
+    fig = go.Figure(go.Bar(
+        x=(limites[:-1] + limites[1:]) / 2,  # Centro de cada intervalo
+        y=contagens,
+        marker_color='#636EFA'  # Cor azul padrão
+    ))
     
     # Personalização adicional do layout
     fig.update_layout(
+        title="Distribuição dos Preços dos Produtos",
+        template="plotly_white",  # Template de fundo branco
         bargap=0.1,  # Espaço entre as barras
         xaxis_title="Preço (R$)",  # Título do eixo X
         yaxis_title="Quantidade de Produtos"  # Título do eixo Y
@@ -105,7 +292,7 @@ def criar_dispersao():
         Figure: Objeto de figura do Plotly contendo o gráfico de dispersão
     """
     fig = px.scatter(
-        df,
+        amostrar_pontos(df),  # Limita a quantidade de pontos enviados
         x='Preço',  # Eixo X: preço
         y='N_Avaliações',  # Eixo Y: número de avaliações
         color='Qtd_Vendidos',  # Cor dos pontos: quantidade vendida
@@ -115,41 +302,49 @@ def criar_dispersao():
             'N_Avaliações': 'Número de Avaliações',
             'Qtd_Vendidos': 'Quantidade Vendida'
         },
-        color_continuous_scale='Viridis'  # Escala de cores
-    )
-    
-    # Personalização do fundo do gráfico
-    fig.update_layout(
-        plot_bgcolor='rgba(240,240,240,0.8)',  # Cor de fundo do gráfico
-        paper_bgcolor='rgba(240,240,240,0.5)'  # Cor de fundo ao redor do gráfico
+        color_continuous_scale='Viridis',  # Escala de cores
+        template=TEMPLATE_CINZA  # Fundo cinza compartilhado
     )
     return fig
 
 def criar_heatmap():
     """
-    Cria um mapa de calor mostrando as correlações entre variáveis numéricas.
+    Cria um mapa de calor mostrando as correlações entre as variáveis
+    numéricas listadas em COLUNAS_HEATMAP.
     
     Retorna:
         Figure: Objeto de figura do Plotly contendo o mapa de calor
     """
-    # Seleciona apenas colunas numéricas
-    numerical_df = df.select_dtypes(include=['float64', 'int64'])
+    # Seleciona apenas as colunas numéricas de interesse (lista pré-calculada)
+    numerical_df = df[COLUNAS_NUMERICAS]
     
-    # Calcula a matriz de correlação
-    correlation_matrix = numerical_df.corr()
-
-    fig = px.imshow(
-        correlation_matrix,
-        title="Mapa de Calor das Correlações entre Variáveis Numéricas",
-        color_continuous_scale='Blues',  # Escala de cores azuis
-        text_auto=True,  # Mostra os valores nas células
-        aspect="auto"  # Ajuste automático de aspecto
-    )
+    # Calcula a matriz de correlação com numpy (uma única operação matricial,
+    # em vez do laço por pares de colunas do pandas). O np.corrcoef não ignora
+    # NaN como o DataFrame.corr(): um único NaN anularia a linha e a coluna
+    # inteiras da variável, então as linhas incompletas são removidas antes
+    valores = numerical_df.dropna().to_numpy()
+    correlacoes = np.corrcoef(valores, rowvar=False)
+
+    # Arredonda para 2 casas: rótulos curtos e menos bytes no JSON
+    correlacoes = correlacoes.round(2)
+    rotulos = numerical_df.columns.tolist()
+
+    # Trace de heatmap montado diretamente; os valores das células são
+    # escritos pelo próprio Plotly.js a partir do texttemplate
+    fig = go.Figure(go.Heatmap(
+        z=correlacoes,
+        x=rotulos,
+        y=rotulos,
+        colorscale='Blues',  # Escala de cores azuis
+        texttemplate='%{z:.2f}'  # Mostra os valores nas células
+    ))
     
-    # Personalização dos eixos
+    # Título e personalização dos eixos (linha da primeira variável no topo)
     fig.update_layout(
+        title="Mapa de Calor das Correlações entre Variáveis Numéricas",
         xaxis_title="Variáveis",
-        yaxis_title="Variáveis"
+        yaxis_title="Variáveis",
+        yaxis_autorange='reversed'
     )
     return fig
 
@@ -160,21 +355,22 @@ def criar_barras():
     Retorna:
         Figure: Objeto de figura do Plotly contendo o gráfico de barras
     """
-    # Conta a frequência de cada marca e pega as 7 mais comuns
-    marcas = df['Marca'].value_counts().head(7)
+    # Frequência das 7 marcas mais comuns (pré-calculada)
+    marcas = TOP_MARCAS
     
-    fig = px.bar(
-        marcas,
-        x=marcas.index,  # Eixo X: nomes das marcas
+    # Um único trace com uma cor por barra (em vez de um trace por marca)
+    fig = go.Figure(go.Bar(
+        x=marcas.index.tolist(),  # Eixo X: nomes das marcas
         y=marcas.values,  # Eixo Y: contagem de produtos
+        marker_color=px.colors.qualitative.Pastel[:len(marcas)]  # Cores pastel
+    ))
+    
+    # Título e rótulos dos eixos
+    fig.update_layout(
         title="Top 7 Marcas mais Populares",
-        labels={'x': 'Marca', 'y': 'Quantidade de Produtos'},
-        color=marcas.index,  # Cores baseadas nas marcas
-        color_discrete_sequence=px.colors.qualitative.Pastel  # Cores pastel
+        xaxis_title="Marca",
+        yaxis_title="Quantidade de Produtos"
     )
-    
-    # Remove a legenda (não necessária para este gráfico)
-    fig.update_layout(showlegend=False)
     return fig
 
 def criar_pizza():
@@ -184,8 +380,8 @@ def criar_pizza():
     Retorna:
         Figure: Objeto de figura do Plotly contendo o gráfico de pizza
     """
-    # Conta a frequência de cada gênero e pega os 3 mais comuns
-    generos = df['Gênero'].value_counts().head(3)
+    # Frequência dos 3 gêneros mais comuns (pré-calculada)
+    generos = TOP_GENEROS
     
     fig = px.pie(
         generos,
@@ -201,21 +397,31 @@ def criar_densidade():
     """
     Cria um gráfico de densidade mostrando a distribuição dos preços.
     
+    A densidade é calculada no servidor com np.histogram, usando todos os
+    preços, e apenas a curva resultante é enviada ao navegador.
+    
     Retorna:
         Figure: Objeto de figura do Plotly contendo o gráfico de densidade
     """
-    fig = px.density_contour(
-        df,
-        x="Preço",
-        title="Densidade dos Preços",
-        color_discrete_sequence=['#00CC96']  # Cor verde
+    # Densidade por faixa de preço (área total igual a 1)
+    densidades, limites = np.histogram(
+        df['Preço'].to_numpy(dtype=np.float32),
+        bins=60,
+        density=True
     )
+    centros = (limites[:-1] + limites[1:]) / 2  # Centro de cada faixa
+
+    fig = go.Figure(go.Scatter(
+        x=centros,
+        y=densidades,
+        mode='lines',
+        fill='tozeroy',  # Preenche a área sob a curva
+        line={'color': '#00CC96'}  # Cor verde
+    ))
     
-    # Preenche as curvas de nível com cores
-    fig.update_traces(contours_coloring="fill", contours_showlabels=True)
-    
-    # Personalização dos eixos
+    # Título e personalização dos eixos
     fig.update_layout(
+        title="Densidade dos Preços",
         xaxis_title="Preço (R$)",
         yaxis_title="Densidade"
     )
@@ -225,37 +431,53 @@ def criar_regressao():
     """
     Cria um gráfico de dispersão com linha de regressão linear.
     
+    A reta é ajustada com todos os dados, mas apenas uma amostra dos pontos
+    é desenhada, para que o tamanho do gráfico não cresça com o dataset.
+    
     Retorna:
-        Figure ou html.Div: Retorna o gráfico ou mensagem de erro se statsmodels não estiver instalado
+        Figure: Objeto de figura do Plotly contendo o gráfico de regressão
     """
-    try:
-        fig = px.scatter(
-            df,
-            x="Preço",
-            y="Qtd_Vendidos",
-            trendline="ols",  # Adiciona linha de regressão linear
-            title="Regressão Linear: Preço vs Quantidade Vendida",
-            labels={
-                'Preço': 'Preço (R$)',
-                'Qtd_Vendidos': 'Quantidade Vendida'
-            },
-            color_discrete_sequence=['#EF553B']  # Cor vermelha
-        )
-        
-        # Personalização do fundo
-        fig.update_layout(
-            plot_bgcolor='rgba(240,240,240,0.8)',
-            paper_bgcolor='rgba(240,240,240,0.5)'
-        )
-        return fig
-    except Exception as e:
-        # Mensagem de erro amigável se statsmodels não estiver instalado
-        return html.Div([
-            html.H4("Erro ao gerar gráfico de regressão"),
-            html.P("Por favor, instale a biblioteca statsmodels:"),
-            html.Pre("pip install statsmodels"),
-            html.P(f"Detalhes do erro: {str(e)}")
-        ], style={'color': 'red', 'padding': '20px'})
+    # Ajuste por mínimos quadrados (coeficiente angular e intercepto),
+    # em float64 para não perder precisão nas somas
+    precos = df['Preço'].to_numpy(dtype=np.float64)
+    vendidos = df['Qtd_Vendidos'].to_numpy(dtype=np.float64)
+    inclinacao, intercepto = np.polyfit(precos, vendidos, 1)
+
+    fig = px.scatter(
+        amostrar_pontos(df),  # Limita a quantidade de pontos enviados
+        x="Preço",
+        y="Qtd_Vendidos",
+        title="Regressão Linear: Preço vs Quantidade Vendida",
+        labels={
+            'Preço': 'Preço (R$)',
+            'Qtd_Vendidos': 'Quantidade Vendida'
+        },
+        color_discrete_sequence=['#EF553B'],  # Cor vermelha
+        template=TEMPLATE_CINZA  # Fundo cinza compartilhado
+    )
+
+    # Linha de regressão: basta ligar os extremos da faixa de preços
+    x_reta = np.array([precos.min(), precos.max()])
+    fig.add_trace(go.Scatter(
+        x=x_reta,
+        y=inclinacao * x_reta + intercepto,
+        mode='lines',
+        name='Regressão (OLS)',
+        line={'color': '#EF553B'},
+        showlegend=False
+    ))
+    return fig
+
+# Dicionário mapeando valores do dropdown para funções de gráfico
+GRAFICOS = {
+    'histograma': criar_histograma,
+    'dispersao': criar_dispersao,
+    'heatmap': criar_heatmap,
+    'barras': criar_barras,
+    'pizza': criar_pizza,
+    'densidade': criar_densidade,
+    'regressao': criar_regressao
+}
 
 # ==============================================
 # 4. INICIALIZAÇÃO DA APLICAÇÃO DASH
@@ -265,13 +487,97 @@ def criar_regressao():
 CONFIGURAÇÃO DA APLICAÇÃO:
 - __name__: Necessário para o Dash identificar recursos estáticos
 - external_stylesheets: Carrega uma folha de estilo CSS externa para melhor aparência
+- external_scripts: Carrega o pacote "cartesian" do Plotly.js (~1 MB), que cobre
+  todos os tipos de gráfico do painel (scatter, bar, heatmap, histogram, pie);
+  com o window.Plotly definido, o dcc.Graph não usa o pacote completo (~3.5 MB)
+- cache: Ligado ao servidor Flask antes de as figuras serem calculadas
 """
 
 app = dash.Dash(
     __name__, 
-    external_stylesheets=['https://codepen.io/chriddyp/pen/bWLwgP.css']
+    external_stylesheets=['https://codepen.io/chriddyp/pen/bWLwgP.css'],
+    external_scripts=['https://cdn.plot.ly/plotly-cartesian-2.27.0.min.js']
 )
 
+# Liga o cache ao servidor Flask do Dash
+cache.init_app(app.server)
+
+def serializar(figura):
+    """
+    Converte uma figura do Plotly em dicionário de tipos nativos do Python.
+    
+    O Dash recebe a figura já convertida e não precisa percorrer e codificar
+    os arrays numpy do gráfico a cada envio.
+    
+    Parâmetros:
+        figura (Figure): Figura do Plotly
+        
+    Retorna:
+        dict: A figura pronta para ser enviada ao navegador
+    """
+    return json.loads(pio.to_json(figura, validate=False))
+
+@cache.memoize(timeout=0)
+def construir_figura(nome, versao_dados):
+    """
+    Cria e serializa o gráfico `nome`, guardando o resultado no cache.
+    
+    A chave do cache é formada pelos argumentos: o primeiro processo a montar
+    um gráfico grava o JSON em disco e os demais apenas o leem. A versão dos
+    dados faz parte da chave para que um CSV (ou código) alterado gere
+    figuras novas.
+    
+    Parâmetros:
+        nome (str): Valor do dropdown correspondente ao gráfico
+        versao_dados (str): Versão dos dados (VERSAO_DADOS)
+        
+    Retorna:
+        dict: A figura serializada
+    """
+    return serializar(GRAFICOS[nome]())
+
+def calcular_figura(nome):
+    """
+    Obtém uma figura serializada durante a inicialização, isolando falhas.
+    
+    Um erro em uma função de gráfico não pode impedir a aplicação de subir:
+    ele é registrado e a figura é substituída por um aviso (que não vai para
+    o cache, para que o gráfico seja refeito na próxima inicialização).
+    
+    Parâmetros:
+        nome (str): Valor do dropdown correspondente ao gráfico
+        
+    Retorna:
+        dict: A figura serializada ou uma figura com a mensagem de erro
+    """
+    try:
+        return construir_figura(nome, VERSAO_DADOS)
+    except Exception as e:
+        print(f"Erro ao gerar o gráfico '{nome}': {e}")
+        fig = go.Figure()
+        fig.add_annotation(
+            text=f"Erro ao gerar este gráfico: {e}",
+            showarrow=False,
+            font={'color': 'red'}
+        )
+        return serializar(fig)
+
+# Pré-calcula e serializa todas as figuras uma única vez, na inicialização.
+# Como o DataFrame não muda durante a execução, a troca de gráfico só precisa
+# consultar este dicionário em vez de reconstruir o gráfico a cada seleção.
+# Se outro processo já calculou uma figura, ela vem direto do cache em disco.
+FIGURAS_JSON = {}
+if not df.empty:
+    with app.server.app_context():  # O cache precisa do contexto do Flask
+        FIGURAS_JSON = {nome: calcular_figura(nome) for nome in GRAFICOS}
+
+# Com as figuras e os resumos prontos, o DataFrame não é mais usado: libera a
+# memória que ele ocupa. A partir daqui as funções de gráfico não podem mais
+# ser chamadas; o layout usa apenas os valores já calculados.
+DADOS_CARREGADOS = not df.empty
+del df
+gc.collect()
+
 # ==============================================
 # 5. LAYOUT DA APLICAÇÃO
 # ==============================================
@@ -287,6 +593,14 @@ ESTILIZAÇÃO:
 - Estilos inline para personalização específica
 """
 
+# Estilo da área do gráfico
+ESTILO_GRAFICO = {
+    'height': '600px',
+    'border': '1px solid #eee',
+    'borderRadius': '5px',
+    'padding': '10px'
+}
+
 app.layout = html.Div([
     # Container principal com estilo
     html.Div([
@@ -336,15 +650,36 @@ app.layout = html.Div([
                     style={'fontWeight': 'bold'}
                 ),
                 html.Ul([
-                    html.Li(f"Total de produtos: {len(df)}"),
-                    html.Li(f"Média de preço: R${df['Preço'].mean():.2f}"),
-                    html.Li(f"Produto mais caro: R${df['Preço'].max():.2f}")
+                    html.Li(f"Total de produtos: {TOTAL_PRODUTOS}"),
+                    html.Li(f"Média de preço: R${PRECO_MEDIO:.2f}"),
+                    html.Li(f"Produto mais caro: R${PRECO_MAXIMO:.2f}")
                 ])
             ], className="six columns", style={'paddingLeft': '20px'})
         ], className="row"),  # row: organiza as colunas lado a lado
 
-        # Área de exibição do gráfico
-        html.Div(id='output-grafico', style={'marginTop': '20px'})
+        # Seleção "estabilizada" do dropdown (atualizada após o debounce)
+        dcc.Store(id='grafico-debounce', data='histograma'),
+
+        # Todas as figuras pré-serializadas, enviadas ao navegador uma única
+        # vez junto com o layout; a troca de gráfico não consulta o servidor
+        dcc.Store(id='figuras', data=FIGURAS_JSON, storage_type='memory'),
+
+        # Mensagem de erro, caso os dados não tenham sido carregados
+        html.Div(
+            "" if DADOS_CARREGADOS else "Erro: Não foi possível carregar os dados.",
+            style={'color': 'red'}
+        ),
+
+        # Área de exibição do gráfico: o componente é sempre o mesmo e o
+        # callback troca apenas a sua figura (o Plotly.js reaproveita o gráfico).
+        # O dcc.Loading mostra um indicador enquanto a nova figura chega.
+        html.Div(
+            dcc.Loading(
+                dcc.Graph(id='output-grafico', style=ESTILO_GRAFICO),
+                type='circle'
+            ),
+            style={'marginTop': '20px'}
+        )
     ], style={
         'maxWidth': '1200px',
         'margin': '0 auto',
@@ -360,59 +695,64 @@ app.layout = html.Div([
 # ==============================================
 
 """
-FUNCIONAMENTO DO CALLBACK:
-1. O decorador @app.callback define a relação entre entrada e saída
-2. Quando o dropdown (Input) muda, a função é acionada
-3. A função retorna o gráfico correspondente para a área de exibição (Output)
+FUNCIONAMENTO DOS CALLBACKS (ambos executados no navegador, sem Python):
+1. O app.clientside_callback define a relação entre entrada e saída
+2. Quando o dropdown muda, o primeiro callback espera 200 ms sem novas
+   mudanças antes de repassar o valor ao 'grafico-debounce'
+3. Quando o 'grafico-debounce' (Input) muda, o segundo callback busca a
+   figura correspondente no Store 'figuras' (State)
+4. A figura é enviada para o gráfico da tela (Output)
 """
 
-@app.callback(
-    Output('output-grafico', 'children'),  # Saída: conteúdo da div 'output-grafico'
-    [Input('grafico-selecionado', 'value')]  # Entrada: valor do dropdown
+# Debounce da seleção: cada mudança cancela a anterior que ainda aguardava,
+# então uma sequência rápida de trocas (ex.: setas do teclado) gera um só
+# redesenho do gráfico, com o último valor escolhido
+DEBOUNCE_SELECAO_JS = """
+function(valor) {
+    var pendente = window._selecaoGraficoPendente;
+    if (pendente) {
+        clearTimeout(pendente.timer);
+        pendente.resolver(window.dash_clientside.no_update);
+    }
+    return new Promise(function(resolver) {
+        window._selecaoGraficoPendente = {
+            resolver: resolver,
+            timer: setTimeout(function() {
+                window._selecaoGraficoPendente = null;
+                resolver(valor);
+            }, 200)
+        };
+    });
+}
+"""
+
+app.clientside_callback(
+    DEBOUNCE_SELECAO_JS,
+    Output('grafico-debounce', 'data'),  # Saída: seleção estabilizada
+    Input('grafico-selecionado', 'value'),  # Entrada: valor do dropdown
+    prevent_initial_call=True  # O Store já começa com o valor padrão
 )
-def atualizar_grafico(grafico):
-    """
-    Atualiza o gráfico exibido com base na seleção do usuário.
-    
-    Parâmetros:
-        grafico (str): Valor do dropdown indicando qual gráfico mostrar
-        
-    Retorna:
-        dcc.Graph ou html.Div: O gráfico selecionado ou mensagem de erro
-    """
-    # Verifica se o DataFrame está vazio (erro no carregamento)
-    if df.empty:
-        return html.Div("Erro: Não foi possível carregar os dados.", style={'color': 'red'})
-
-    # Dicionário mapeando valores do dropdown para funções de gráfico
-    graficos = {
-        'histograma': criar_histograma,
-        'dispersao': criar_dispersao,
-        'heatmap': criar_heatmap,
-        'barras': criar_barras,
-        'pizza': criar_pizza,
-        'densidade': criar_densidade,
-        'regressao': criar_regressao
+
+# Troca de gráfico: apenas consulta a figura já serializada no Store.
+# Devolve uma cópia: o Plotly.js grava o autorange e o zoom no layout da figura
+# recebida, e sem a cópia essas alterações ficariam guardadas no Store (ao
+# voltar a um gráfico, ele reapareceria com o zoom anterior).
+# Para uma seleção desconhecida (ou sem dados carregados), usa uma figura vazia
+SELECIONAR_FIGURA_JS = """
+function(grafico, figuras) {
+    if (!figuras || !figuras[grafico]) {
+        return {};
     }
+    return JSON.parse(JSON.stringify(figuras[grafico]));
+}
+"""
 
-    # Obtém a função correspondente ao gráfico selecionado
-    # Se não existir, usa uma função que retorna uma figura vazia
-    figura = graficos.get(grafico, lambda: go.Figure())()
-
-    # Se a função retornar um componente HTML (como no caso de erro da regressão)
-    if isinstance(figura, html.Div):
-        return figura
-
-    # Retorna o gráfico com estilos aplicados
-    return dcc.Graph(
-        figure=figura,
-        style={
-            'height': '600px',
-            'border': '1px solid #eee',
-            'borderRadius': '5px',
-            'padding': '10px'
-        }
-    )
+app.clientside_callback(
+    SELECIONAR_FIGURA_JS,
+    Output('output-grafico', 'figure'),  # Saída: figura do gráfico 'output-grafico'
+    Input('grafico-debounce', 'data'),  # Entrada: seleção após o debounce
+    State('figuras', 'data')  # Figuras pré-serializadas
+)
 
 # ==============================================
 # 7. CONFIGURAÇÕES PARA DEPLOY
@@ -421,6 +761,9 @@ def atualizar_grafico(grafico):
 """
 IMPORTANTE PARA DEPLOY NO RENDER:
 - A variável 'server' é necessária para o Gunicorn identificar a aplicação
+- Use 'gunicorn --preload app:server': os dados e as figuras são carregados
+  uma única vez no processo principal e os workers criados depois (fork)
+  compartilham essa memória, em vez de cada um carregar a sua cópia
 - O bloco if __name__ é usado para execução local
 """
 